@@ -1,2 +1,9 @@
 from . import agent
-from .agent import risk_assessment_agent_tool
+
+
+def __getattr__(name: str):
+    # Resolved lazily so that importing the package does not build the agent (and
+    # load ADK) until `risk_assessment_agent_tool` is actually requested.
+    if name == "risk_assessment_agent_tool":
+        return agent.get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -20,42 +20,234 @@ This module enables:
 - Tailoring based on life stage (Working vs Retired).
 - Clean, single-response updates to the FSO via the ADK-defined Agent interface.
 
+To keep output tokens small, the model's final response is only a JSON-patch
+adding `risk_assessment_data`; the agent's callbacks apply it to the FSO it
+received, so callers still see the fully updated FSO.
+
 No natural-language explanation should be returned outside the final updated FSO.
 """
 
-from google.adk.agents.llm_agent import Agent
-from .tools import risk_score_calculator 
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from . import fso
+from .tools import risk_score_calculator, risk_score_calculator_bulk
+
+if TYPE_CHECKING:
+    # The ADK/gRPC stack is only imported when the agent is actually built or run,
+    # so importing this package for the tools alone stays fast.
+    from google.adk.agents.callback_context import CallbackContext
+    from google.adk.agents.llm_agent import Agent
+    from google.adk.models.llm_response import LlmResponse
+    from google.genai import types
+
+# Session-state key holding the FSO this agent was handed, for patch application.
+SOURCE_FSO_STATE_KEY = "risk_assessment_source_fso"
+
+# Invocation-scoped flag: whether this turn's user message was itself the FSO.
+INPUT_IS_FSO_STATE_KEY = "temp:risk_assessment_input_is_fso"
+
+# Session-state key holding the user's structured answers to Q3-Q5.
+ANSWERS_STATE_KEY = "risk_assessment_answers"
+
+# Keys of the single structured reply to the qualitative questions.
+_ANSWER_KEYS = frozenset({"income_stability_rating", "volatility_choice", "has_dependents"})
+
+# Keys that mark a JSON message as an FSO rather than a reply to Q3-Q5.
+_FSO_MARKER_KEYS = frozenset({
+    "user_age", "user_status", "users", "risk_inputs", "risk_assessment_data",
+    "time_horizon_years", "emergency_fund_months", "debt_exceeds_assets",
+})
+
+# Session-state key the agent writes the updated FSO to.
+FSO_OUTPUT_KEY = "financial_state_object"
 
-# --- OPTIMIZED AGENT INSTRUCTION (FSO Integrated) ---
+# --- OPTIMIZED AGENT INSTRUCTION (FSO Integrated, token-efficient) ---
 optimized_agent_instruction = """
-You are the Financial Risk Analyst. Your goal: establish the user's Risk Profile (tolerance, capacity, protection gaps) by reading data from the Financial State Object (FSO) and asking qualitative questions. Tone: professional and analytical.
-
-**PROCESS MANDATE (FSO-DRIVEN):**
-
-1.  **FSO Input/Output:** You will receive the FSO as a JSON string. Your ONLY output MUST be the **UPDATED FSO**.
-2.  **Data Extraction & Initial Notice:**
-    * Explain you are using their existing financial data, but need a few quick qualitative answers to finalize their profile.
-    * **Crucially, extract the following from FSO:** user_age, user_status, Time Horizon, Emergency Fund Coverage, Debt vs Assets.
-3.  **Collect Remaining Qualitative Fields (Interactive):**
-    * **Only ask the user the following qualitative questions (as they are not numeric FSO data):**
-        * Q3. Income Stability: "Rate your income stability (1=Unstable to 5=Highly stable)." (Note: If Retired, this should default to 5 if drawdown is safe).
-        * Q4. Market Reaction: "If your portfolio dropped 20%, would you (A) Sell, (B) Hold, (C) Invest more?"
-        * Q5. Dependents: "Do you have financial dependents? (Yes/No)"
-4.  **Tool Use:**
-    * Compile the 6 required parameters (3 extracted, 3 prompted) into the input structure.
-    * Call `risk_score_calculator` with the final parameters.
-5.  **FSO Update:**
-    * Retrieve the JSON output from the tool (Risk Category, Score, Gaps).
-    * Append this analysis to a new key in the FSO, specifically **'risk_assessment_data'**.
-6.  **Final Output:** Your *only* response is the fully updated FSO.
+Input: the FSO as a JSON string.
+1. Tell the user you are using their FSO data and need 3 quick answers.
+2. Extract from FSO: user_age, user_status, Q1 time_horizon_years, Q2 emergency_fund_months, Q6 debt_exceeds_assets.
+3. Ask Q3-Q5 together in ONE message and request a single reply, ideally JSON:
+{"income_stability_rating":1-5,"volatility_choice":"A|B|C","has_dependents":true|false}
+Q3 "Rate your income stability (1=Unstable to 5=Highly stable)." If Retired with safe drawdown, use 5 without asking.
+Q4 "If your portfolio dropped 20%, would you (A) Sell, (B) Hold, (C) Invest more?"
+Q5 "Do you have financial dependents? (Yes/No)"
+Parse the reply; re-ask only answers that are missing or unclear.
+4. Call risk_score_calculator(time_horizon_years, emergency_fund_months, income_stability_rating, volatility_choice, has_dependents, debt_exceeds_assets).
+If the FSO has a users list: do steps 2-3 per user, then call risk_score_calculator_bulk ONCE with one row (same 6 keys) per user.
+5. Final output: ONLY a JSON-patch array, no prose and no FSO echo:
+[{"op":"add","path":"/risk_assessment_data","value":<tool result>}]
+For a users list, one op per user with path "/users/<index>/risk_assessment_data".
 """
 
+
+def _content_text(content: Optional[types.Content]) -> str:
+    """Concatenate the (non-thought) text parts of `content` (empty if there are none)."""
+    if content is None or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if part.text and not part.thought)
+
+
+def _source_fso(state) -> Optional[Dict[str, Any]]:
+    """
+    The FSO this agent should update.
+
+    An FSO sent as this turn's input wins. On later turns (answers to Q3-Q5) the
+    FSO in state under `FSO_OUTPUT_KEY` is preferred, as an upstream agent may have
+    updated it since the capture; the captured FSO is used while that key holds
+    something else, such as this agent's own questions.
+    """
+    captured = state.get(SOURCE_FSO_STATE_KEY)
+    if captured is not None and state.get(INPUT_IS_FSO_STATE_KEY):
+        return captured
+    stored = state.get(FSO_OUTPUT_KEY)
+    if isinstance(stored, str):
+        try:
+            stored = fso.loads(stored)
+        except ValueError:
+            stored = None
+    return stored if isinstance(stored, dict) else captured
+
+
+def _finish_assessment(state) -> None:
+    """Forget the captured FSO and answers once the FSO has been updated."""
+    state[SOURCE_FSO_STATE_KEY] = None
+    state[ANSWERS_STATE_KEY] = {}
+
+
+def _capture_source_fso(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    before_agent_callback: remember the incoming FSO in session state.
+
+    Only messages that parse as a JSON object are treated as the FSO. A JSON
+    reply to Q3-Q5 only has its answer keys merged into the stored answers. Such
+    a reply either holds nothing but answer keys or, while a captured FSO awaits
+    its answers, shares keys with them and carries no FSO fields (extra keys are
+    then ignored). Plain-text answers leave the stored state untouched.
+    """
+    callback_context.state[INPUT_IS_FSO_STATE_KEY] = False
+    try:
+        data = fso.loads(_content_text(callback_context.user_content))
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    awaiting_answers = callback_context.state.get(SOURCE_FSO_STATE_KEY) is not None
+    if (data and data.keys() <= _ANSWER_KEYS) or (
+        awaiting_answers and data.keys() & _ANSWER_KEYS and not data.keys() & _FSO_MARKER_KEYS
+    ):
+        answers = callback_context.state.get(ANSWERS_STATE_KEY) or {}
+        replied = {key: data[key] for key in data.keys() & _ANSWER_KEYS}
+        callback_context.state[ANSWERS_STATE_KEY] = {**answers, **replied}
+    else:
+        callback_context.state[SOURCE_FSO_STATE_KEY] = data
+        callback_context.state[ANSWERS_STATE_KEY] = {}
+        callback_context.state[INPUT_IS_FSO_STATE_KEY] = True
+    return None
+
+
+def _score_known_fso(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    before_agent_callback: skip the LLM when the FSO already holds every input.
+
+    Structured Q3-Q5 answers from the user count as inputs too, so a complete
+    JSON reply is scored without another model turn. Runs the fixed plan
+    (extract Q1-Q6, call `risk_score_calculator`, add `risk_assessment_data`)
+    directly and returns the updated FSO as the agent's reply. Returns None,
+    falling through to the model, when any input is missing.
+    """
+    source = _source_fso(callback_context.state)
+    if source is None:
+        return None
+    answers = callback_context.state.get(ANSWERS_STATE_KEY) or {}
+    inputs = fso.extract_risk_inputs(source, answers)
+    if inputs is None:
+        return None
+
+    from google.genai import types
+
+    updated = fso.dumps({**source, "risk_assessment_data": risk_score_calculator(**inputs)})
+    # A callback reply bypasses the model, so output_key is not applied for us.
+    callback_context.state[FSO_OUTPUT_KEY] = updated
+    _finish_assessment(callback_context.state)
+    return types.Content(role="model", parts=[types.Part(text=updated)])
+
+
+def _expand_fso_patch(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """
+    after_model_callback: replace the model's JSON-patch with the updated FSO.
+
+    Anything that is not a patch (questions to the user, tool calls, partial
+    chunks) is passed through unchanged. A patch is never passed through: it
+    would be saved under `output_key` in place of the FSO. If it cannot be
+    applied, the unchanged FSO is returned instead. With no FSO at all, the
+    response becomes an error with no content, so ADK leaves `output_key` as is.
+    """
+    text = _content_text(llm_response.content).strip()
+    if llm_response.partial or not text:
+        return None
+
+    # Models occasionally wrap JSON in a markdown code fence.
+    text = text.removeprefix("```json").removeprefix("```").removesuffix("```")
+    try:
+        patch = fso.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(patch, list):
+        return None
+
+    source = _source_fso(callback_context.state)
+    if source is None:
+        return llm_response.model_copy(update={
+            "content": None,
+            "error_code": "NO_FSO",
+            "error_message": "Risk assessment could not be applied: no Financial State Object was provided.",
+        })
+    try:
+        reply = fso.dumps(fso.apply_patch(source, patch))
+    except ValueError:
+        reply = fso.dumps(source)
+    _finish_assessment(callback_context.state)
+
+    from google.genai import types
+
+    return llm_response.model_copy(
+        update={"content": types.Content(role="model", parts=[types.Part(text=reply)])}
+    )
+
+
 # --- AGENT DEFINITION ---
-risk_assessment_agent_tool = Agent(
-    model='gemini-2.5-flash',
-    name='risk_assessment_agent',
-    description='Assesses capacity (age/status) and tolerance from the FSO and user input, determines a suitable Investment Profile, identifies Insurance Gaps, and updates the FSO.',
-    instruction=optimized_agent_instruction,
-    tools=[risk_score_calculator], 
-    output_key="financial_state_object"
-)
\ No newline at end of file
+@functools.lru_cache(maxsize=1)
+def get_agent() -> Agent:
+    """
+    Build the Risk Assessment Agent once and return the shared instance.
+
+    Every caller (the package export, parent agents, tests) receives the same
+    object, so the model and tool registry are only initialised a single time
+    per process. ADK is imported here rather than at module import.
+    """
+    from google.adk.agents.llm_agent import Agent
+
+    return Agent(
+        model='gemini-2.5-flash',
+        name='risk_assessment_agent',
+        description='Assesses capacity (age/status) and tolerance from the FSO and user input, determines a suitable Investment Profile, identifies Insurance Gaps, and updates the FSO.',
+        # Sent verbatim as the system instruction, ahead of the FSO/user turns,
+        # so the prefix stays byte-identical and eligible for prompt caching.
+        static_instruction=optimized_agent_instruction,
+        tools=[risk_score_calculator, risk_score_calculator_bulk],
+        before_agent_callback=[_capture_source_fso, _score_known_fso],
+        after_model_callback=_expand_fso_patch,
+        output_key=FSO_OUTPUT_KEY
+    )
+
+
+def __getattr__(name: str):
+    # `risk_assessment_agent_tool` is built on first access, not at import time.
+    if name == "risk_assessment_agent_tool":
+        return get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
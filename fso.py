@@ -0,0 +1,134 @@
+"""
+fso.py — Financial State Object (FSO) Helpers
+=============================================
+
+The FSO travels between agents as a JSON string. This module holds the
+host-side helpers the Risk Assessment Agent uses to read and write it.
+
+(De)serialisation uses **orjson** when it is installed (native UTF-8 handling,
+several times faster than the stdlib on realistic FSO payloads) and falls back
+to the standard-library `json` module otherwise. Both paths produce compact,
+UTF-8 JSON text so callers never need to know which backend is active.
+
+Rather than echoing the whole FSO back, the agent emits an RFC 6902 JSON-patch
+(e.g. `[{"op": "add", "path": "/risk_assessment_data", "value": {...}}]`);
+`apply_patch` turns that delta into the updated FSO on the host. Only `add`
+operations on the risk-assessment keys are accepted, so the model can never
+remove or rewrite other parts of the user's FSO.
+
+When an FSO already carries every calculator input (e.g. from an intake form or
+an earlier session), `extract_risk_inputs` reads them from the FSO's top level
+or its `risk_inputs` object, so the agent can score without an LLM turn.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib backend is used instead.
+    orjson = None
+    import json
+
+# The only patch targets the agent may write (see `apply_patch`).
+_RISK_PATCH_PATH = re.compile(r"/(?:users/(0|[1-9][0-9]*)/)?risk_assessment_data")
+
+# FSO object that may hold calculator inputs, besides the FSO's top level.
+RISK_INPUT_SECTION = "risk_inputs"
+
+# Calculator inputs (with the types they must have) for the deterministic fast path.
+RISK_INPUT_FIELDS = (
+    ("time_horizon_years", int),
+    ("emergency_fund_months", int),
+    ("income_stability_rating", int),
+    ("volatility_choice", str),
+    ("has_dependents", bool),
+    ("debt_exceeds_assets", bool),
+)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse an FSO (or any JSON document) from a `str` or `bytes` payload.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialise `obj` to a compact JSON string.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def apply_patch(fso: Dict[str, Any], patch: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Apply the agent's JSON-patch to `fso` and return the updated copy.
+
+    Only the patches the agent is instructed to emit are accepted: RFC 6902 `add`
+    operations on `/risk_assessment_data` or `/users/<index>/risk_assessment_data`.
+    The input FSO is left untouched. Raises `ValueError` for any other operation
+    or path, or if the targeted user does not exist.
+    """
+    updated = dict(fso)
+    users = None
+    for operation in patch:
+        if not isinstance(operation, dict) or operation.get("op") != "add" or "value" not in operation:
+            raise ValueError(f"Unsupported FSO patch operation: {operation!r}")
+        match = _RISK_PATCH_PATH.fullmatch(str(operation.get("path", "")))
+        if match is None:
+            raise ValueError(f"Unsupported FSO patch path: {operation.get('path')!r}")
+
+        if match.group(1) is None:
+            updated["risk_assessment_data"] = operation["value"]
+            continue
+
+        if users is None:
+            if not isinstance(updated.get("users"), list):
+                raise ValueError("FSO has no users list to patch")
+            users = updated["users"] = list(updated["users"])
+        index = int(match.group(1))
+        if index >= len(users) or not isinstance(users[index], dict):
+            raise ValueError(f"FSO has no user at index {index}")
+        users[index] = {**users[index], "risk_assessment_data": operation["value"]}
+    return updated
+
+
+def extract_risk_inputs(
+    fso: Dict[str, Any], overrides: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Return the six `risk_score_calculator` arguments if the FSO already holds them.
+
+    Inputs are read only from the FSO's top level or its `risk_inputs` object, so
+    same-named fields of nested records (a spouse, a dependent) are never picked
+    up. Values in `overrides` (e.g. the user's structured answers) take precedence.
+    Returns None if any input is missing, present in both FSO locations, or has the
+    wrong type, in which case the agent must collect it interactively.
+    """
+    section = fso.get(RISK_INPUT_SECTION)
+    if not isinstance(section, dict):
+        section = {}
+    overrides = overrides or {}
+
+    inputs = {}
+    for name, expected in RISK_INPUT_FIELDS:
+        if name in overrides:
+            value = overrides[name]
+        elif name in fso and name in section:
+            return None  # Ambiguous: let the agent decide.
+        elif name in fso:
+            value = fso[name]
+        elif name in section:
+            value = section[name]
+        else:
+            return None
+        # bool is an int subclass, so reject it explicitly for the numeric inputs.
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            return None
+        inputs[name] = value
+    return inputs
@@ -0,0 +1,197 @@
+"""Tests for the host-side FSO callbacks of the Risk Assessment Agent."""
+
+from types import SimpleNamespace
+
+import pytest
+
+types = pytest.importorskip("google.genai.types")
+LlmResponse = pytest.importorskip("google.adk.models.llm_response").LlmResponse
+
+from .. import agent, fso
+
+FSO = {"user_age": 40, "user_status": "Working"}
+RESULT = {"raw_risk_score": 37, "risk_profile": "Moderate"}
+
+
+def _context(state=None, text=None):
+    content = None
+    if text is not None:
+        content = types.Content(role="user", parts=[types.Part(text=text)])
+    return SimpleNamespace(state={} if state is None else state, user_content=content)
+
+
+def _model_reply(text):
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def _patch(path="/risk_assessment_data", op="add"):
+    return fso.dumps([{"op": op, "path": path, "value": RESULT}])
+
+
+def _expand(ctx, text):
+    response = agent._expand_fso_patch(ctx, _model_reply(text))
+    return None if response is None else response.content.parts[0].text
+
+
+def test_input_fso_is_captured_and_patched():
+    ctx = _context(text=fso.dumps(FSO))
+    agent._capture_source_fso(ctx)
+
+    updated = fso.loads(_expand(ctx, "```json\n" + _patch() + "\n```"))
+
+    assert updated == {**FSO, "risk_assessment_data": RESULT}
+
+
+def test_plain_text_answers_do_not_replace_the_fso():
+    ctx = _context(text=fso.dumps(FSO))
+    agent._capture_source_fso(ctx)
+    ctx.user_content = _context(text="4, B, yes").user_content
+    agent._capture_source_fso(ctx)
+
+    assert ctx.state[agent.SOURCE_FSO_STATE_KEY] == FSO
+
+
+def test_questions_pass_through_unchanged():
+    ctx = _context(text=fso.dumps(FSO))
+    agent._capture_source_fso(ctx)
+
+    assert _expand(ctx, "How stable is your income (1-5)?") is None
+
+
+def test_falls_back_to_fso_left_in_state_by_upstream_agent():
+    ctx = _context(state={agent.FSO_OUTPUT_KEY: fso.dumps(FSO)}, text="C")
+    agent._capture_source_fso(ctx)
+
+    updated = fso.loads(_expand(ctx, _patch()))
+
+    assert updated == {**FSO, "risk_assessment_data": RESULT}
+
+
+@pytest.mark.parametrize(
+    "patch",
+    [
+        _patch(op="remove"),
+        _patch(op="replace"),
+        _patch(path="/user_age"),
+        _patch(path="/users/0/risk_assessment_data"),  # FSO has no users list
+        "[1, 2]",
+    ],
+)
+def test_disallowed_or_invalid_patch_keeps_the_fso(patch):
+    ctx = _context(text=fso.dumps(FSO))
+    agent._capture_source_fso(ctx)
+
+    assert fso.loads(_expand(ctx, patch)) == FSO
+
+
+def test_patch_without_any_fso_is_an_error_and_not_saved():
+    response = agent._expand_fso_patch(_context(), _model_reply(_patch()))
+
+    assert response.content is None  # Nothing for ADK to save under output_key.
+    assert response.error_code == "NO_FSO"
+
+
+def test_applied_patch_clears_the_captured_fso():
+    ctx = _context(text=fso.dumps(FSO))
+    agent._capture_source_fso(ctx)
+    _expand(ctx, _patch())
+
+    assert ctx.state[agent.SOURCE_FSO_STATE_KEY] is None
+    assert ctx.state[agent.ANSWERS_STATE_KEY] == {}
+
+
+def test_newer_state_fso_beats_an_earlier_capture():
+    ctx = _context(text=fso.dumps(FSO))
+    agent._capture_source_fso(ctx)
+    newer = {**FSO, "user_age": 41}
+    ctx.state[agent.FSO_OUTPUT_KEY] = fso.dumps(newer)  # Updated upstream meanwhile.
+    ctx.user_content = _context(text="4, B, yes").user_content
+    agent._capture_source_fso(ctx)
+
+    assert fso.loads(_expand(ctx, _patch())) == {**newer, "risk_assessment_data": RESULT}
+
+
+def test_users_patch_updates_only_the_target_user():
+    source = {"users": [{"name": "a"}, {"name": "b"}]}
+
+    updated = fso.apply_patch(source, fso.loads(_patch(path="/users/1/risk_assessment_data")))
+
+    assert updated["users"] == [{"name": "a"}, {"name": "b", "risk_assessment_data": RESULT}]
+    assert source == {"users": [{"name": "a"}, {"name": "b"}]}
+
+
+INPUTS = {
+    "time_horizon_years": 12,
+    "emergency_fund_months": 4,
+    "income_stability_rating": 4,
+    "volatility_choice": "B",
+    "has_dependents": True,
+    "debt_exceeds_assets": False,
+}
+
+
+def test_complete_fso_is_scored_without_the_model():
+    section = {k: v for k, v in INPUTS.items() if k != "time_horizon_years"}
+    source = {**FSO, "time_horizon_years": 12, "risk_inputs": section}
+    ctx = _context(text=fso.dumps(source))
+    agent._capture_source_fso(ctx)
+
+    reply = agent._score_known_fso(ctx)
+
+    updated = fso.loads(reply.parts[0].text)
+    assert updated["risk_assessment_data"]["risk_profile"] == "Moderate"
+    assert ctx.state[agent.FSO_OUTPUT_KEY] == reply.parts[0].text
+    assert ctx.state[agent.SOURCE_FSO_STATE_KEY] is None
+
+
+def test_inputs_of_nested_records_are_ignored():
+    assert fso.extract_risk_inputs({"spouse": dict(INPUTS)}) is None
+
+
+def test_input_in_both_locations_is_ambiguous():
+    assert fso.extract_risk_inputs({**INPUTS, "risk_inputs": {"has_dependents": False}}) is None
+
+
+def test_answers_reply_with_extra_keys_keeps_the_fso():
+    ctx = _context(text=fso.dumps(FSO))
+    agent._capture_source_fso(ctx)
+    reply = {
+        "income_stability_rating": 4,
+        "volatility_choice": "C",
+        "has_dependents": True,
+        "note": "hi",
+    }
+    ctx.user_content = _context(text=fso.dumps(reply)).user_content
+    agent._capture_source_fso(ctx)
+
+    assert ctx.state[agent.SOURCE_FSO_STATE_KEY] == FSO
+    assert ctx.state[agent.ANSWERS_STATE_KEY] == {
+        "income_stability_rating": 4, "volatility_choice": "C", "has_dependents": True
+    }
+    assert fso.loads(_expand(ctx, _patch())) == {**FSO, "risk_assessment_data": RESULT}
+
+
+def test_fso_without_marker_keys_is_captured_as_the_fso():
+    client = {"client": "Ann", "age": 52, "has_dependents": True, "assets": 500000}
+    ctx = _context(text=fso.dumps(client))
+    agent._capture_source_fso(ctx)
+
+    assert ctx.state[agent.SOURCE_FSO_STATE_KEY] == client
+    assert ctx.state[agent.ANSWERS_STATE_KEY] == {}
+
+
+def test_partial_answer_replies_accumulate_and_complete_the_fast_path():
+    objective = ("time_horizon_years", "emergency_fund_months", "debt_exceeds_assets")
+    source = {key: INPUTS[key] for key in objective}
+    ctx = _context(text=fso.dumps(source))
+    agent._capture_source_fso(ctx)
+
+    replies = ({"income_stability_rating": 4, "volatility_choice": "B"}, {"has_dependents": True})
+    for reply in replies:
+        assert agent._score_known_fso(ctx) is None
+        ctx.user_content = _context(text=fso.dumps(reply)).user_content
+        agent._capture_source_fso(ctx)
+
+    updated = fso.loads(agent._score_known_fso(ctx).parts[0].text)
+    assert updated == {**source, "risk_assessment_data": updated["risk_assessment_data"]}
+    assert updated["risk_assessment_data"]["raw_risk_score"] == 37
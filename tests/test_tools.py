@@ -0,0 +1,139 @@
+"""Tests for the risk scoring tools."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from .. import tools
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv(tools.CACHE_DB_ENV_VAR, str(tmp_path / "risk_cache.db"))
+    monkeypatch.setattr(tools, "_cache_db", None)
+    tools._scored.cache_clear()
+    yield
+    tools._cache_db.close()
+    tools._scored.cache_clear()
+
+
+def test_float_inputs_share_the_int_cache_entry():
+    tools._scored.cache_clear()
+    as_float = tools.risk_score_calculator(10.0, 4.0, 4.0, "B", True, False)
+    as_int = tools.risk_score_calculator(10, 4, 4, "B", True, False)
+
+    assert as_float == as_int
+    assert type(as_int["raw_risk_score"]) is int
+
+
+def test_sqlite_cache_accepts_non_canonical_inputs(sqlite_cache):
+    first = tools.risk_score_calculator(10.0, 4, 4, "B", "Yes", 0)
+    tools._scored.cache_clear()  # Force the next call to be served from SQLite.
+    second = tools.risk_score_calculator(10, 4, 4, "hold", True, False)
+
+    assert first == second
+    assert first["insurance_gaps"] == "Potential Need for Life and Disability Insurance."
+
+
+@pytest.fixture
+def restore_default_weights():
+    yield
+    tools.configure_scoring({})
+
+
+@pytest.mark.parametrize("weights", [{}, {"horizon_edges": (3, 10), "income_points": 7}])
+def test_scalar_and_batch_paths_agree(weights, restore_default_weights):
+    pytest.importorskip("numpy")
+    tools.configure_scoring(weights)
+    grid = [
+        (th, ef, inc, vol, dep, debt)
+        for th in range(0, 20, 2)
+        for ef in range(0, 8)
+        for inc in range(1, 6)
+        for vol in range(3)
+        for dep, debt in ((True, False), (False, True))
+    ]
+
+    batch = tools.risk_score_calculator_batch(*zip(*grid))
+
+    for i, (th, ef, inc, vol, dep, debt) in enumerate(grid):
+        scalar = tools.risk_score_calculator(th, ef, inc, "abc"[vol], dep, debt)
+        assert scalar == {key: values[i].item() for key, values in batch.items()}
+
+
+def test_reversed_edges_are_rejected(restore_default_weights):
+    with pytest.raises(ValueError):
+        tools.configure_scoring({"horizon_edges": (10, 3)})
+
+
+def test_empty_batch_returns_empty_arrays():
+    pytest.importorskip("numpy")
+    batch = tools.risk_score_calculator_batch([], [], [], [], [], [])
+
+    assert set(batch) == {"raw_risk_score", "risk_profile", "investment_time_horizon",
+                          "insurance_gaps", "liquidity_risk"}
+    assert all(len(values) == 0 for values in batch.values())
+
+
+@pytest.mark.parametrize("code", [-1, 3])
+def test_batch_rejects_unknown_volatility_codes(code):
+    pytest.importorskip("numpy")
+    with pytest.raises(ValueError, match="volatility_code"):
+        tools.risk_score_calculator_batch([10], [4], [4], [code], [True], [False])
+
+
+def test_importing_the_package_loads_no_heavy_dependencies():
+    # Run in a fresh interpreter: this test session may already have them loaded.
+    package_dir = Path(tools.__file__).resolve().parent
+    code = (
+        f"import sys; import {package_dir.name}; "
+        "print(sorted(m for m in ('google.adk', 'google.genai', 'numpy', 'numba') if m in sys.modules))"
+    )
+    loaded = subprocess.run(
+        [sys.executable, "-c", code], cwd=package_dir.parent, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+    assert loaded == "[]"
+
+
+BULK_ROWS = [
+    {"time_horizon_years": th, "emergency_fund_months": ef, "income_stability_rating": inc,
+     "volatility_choice": vol, "has_dependents": dep, "debt_exceeds_assets": debt}
+    for th, ef, inc, vol, dep, debt in [
+        (20, 8, 5, "C", True, False),
+        (10, 4, 3, " hold steady ", False, True),
+        (2, 0, 1, "sell", False, False),
+        (7, 3, 2, "unknown", True, True),
+    ]
+]
+
+
+@pytest.mark.parametrize("rows", [[], BULK_ROWS])
+def test_bulk_matches_the_scalar_tool(rows):
+    pytest.importorskip("numpy")
+    expected = [tools.risk_score_calculator(**row) for row in rows]
+
+    assert tools.risk_score_calculator_bulk(rows) == expected
+
+
+def test_bulk_falls_back_to_scalar_scoring_without_numpy(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)  # Makes `import numpy` raise ImportError.
+    expected = [tools.risk_score_calculator(**row) for row in BULK_ROWS]
+
+    assert tools.risk_score_calculator_bulk(BULK_ROWS) == expected
+
+
+def test_default_and_empty_configuration_share_cache_keys(restore_default_weights):
+    default_key = tools._cache_key(10, 4, 4, 1, True, False)
+    tools.configure_scoring({})
+
+    assert tools._cache_key(10, 4, 4, 1, True, False) == default_key
+
+
+def test_sqlite_cache_skips_inputs_outside_int32(sqlite_cache):
+    result = tools.risk_score_calculator(3_000_000_000, 4, 4, "B", True, False)
+
+    assert result["investment_time_horizon"] == "Long-term (Aggressive Capacity)"
+    assert tools._cache_db.execute("SELECT COUNT(*) FROM risk_scores").fetchone()[0] == 0
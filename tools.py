@@ -25,9 +25,300 @@ The output is designed to be FSO-friendly and is stored under
 
 This tool does NOT modify the FSO directly. It simply returns a structured  
 dictionary for the agent to merge into the Financial State Object.
+
+Scoring reference (default weights)
+-----------------------------------
+The tool docstring is sent to the model on every request, so it stays short;
+the full reference lives here and in the README.
+
+- Time horizon: >= 15 years long-term, 5-14 medium-term, < 5 short-term.
+- Emergency fund: >= 6 months strong, 3-5 moderate, < 3 weak.
+- Income stability: 1 (unstable) to 5 (highly stable).
+- Volatility answer (case-insensitive): "A"/"sell" conservative,
+  "B"/"hold"/"hold steady" moderate, "C"/"invest more" aggressive;
+  anything else is treated as conservative.
+- Profile: score >= 60 Aggressive, 35-59 Moderate, below 35 Conservative.
+- Dependents flag an insurance gap; debt above assets flags liquidity risk.
+
+The model is intentionally simplified for LLM orchestration; validating and
+parsing the user's answers is the agent's job.
+"""
+
+import functools
+import hashlib
+from dataclasses import dataclass
+import os
+import sqlite3
+import struct
+from typing import Dict, Any, List, Optional
+
+__all__ = [
+    "RiskResult",
+    "risk_score_calculator",
+    "risk_score_calculator_batch",
+    "risk_score_calculator_bulk",
+    "configure_scoring",
+]
+
+# Volatility answer -> tolerance code (0 = Conservative, 1 = Moderate, 2 = Aggressive).
+_VOL_CODE = {
+    "c": 2, "invest more": 2,
+    "b": 1, "hold": 1, "hold steady": 1,
+    "a": 0, "sell": 0,
+}
+
+# --- Output labels (a closed set, shared by every call) ---
+_PROFILE_CONSERVATIVE = "Conservative"
+_PROFILE_MODERATE = "Moderate"
+_PROFILE_AGGRESSIVE = "Aggressive"
+
+_TIME_SHORT = "Short-term (Conservative Capacity)"
+_TIME_MEDIUM = "Medium-term (Moderate Capacity)"
+_TIME_LONG = "Long-term (Aggressive Capacity)"
+
+_INS_YES = "Potential Need for Life and Disability Insurance."
+_INS_NO = "Basic Coverage Only."
+
+_LIQ_YES = "High Liquidity Risk and Financial Stress."
+_LIQ_NO = "Balanced."
+
+# Path of an optional SQLite cache shared by worker processes; unset disables it.
+CACHE_DB_ENV_VAR = "RISK_SCORE_CACHE_DB"
+
+_cache_db: Optional[sqlite3.Connection] = None
+
+# Labels indexed by the codes returned from `_score_core`.
+_PROFILES = (_PROFILE_CONSERVATIVE, _PROFILE_MODERATE, _PROFILE_AGGRESSIVE)
+_TIME_CATEGORIES = (_TIME_SHORT, _TIME_MEDIUM, _TIME_LONG)
+
+# Scoring weights and bin edges, in double-scale points (see `_score_core`).
+# Edges are (lower, upper) thresholds; each edge crossed adds the points once more.
+DEFAULT_SCORING_WEIGHTS = {
+    "horizon_edges": (5, 15),
+    "horizon_points": 20,
+    "fund_edges": (3, 6),
+    "fund_points": 10,
+    "income_points": 5,
+    "volatility_points": 30,
+    "profile_edges": (70, 120),
+}
+
+_weights: Dict[str, Any] = dict(DEFAULT_SCORING_WEIGHTS)
+
+# Bump whenever the scoring rules or the cached record layout change, so entries
+# written by an older release are never served.
+_CACHE_SCHEMA_VERSION = 1
+
+# Signed 32-bit range of the packed numeric inputs (see `_cache_key`).
+_INT32_MIN, _INT32_MAX = -(2 ** 31), 2 ** 31 - 1
+
+
+def _cache_salt(weights: Dict[str, Any]) -> bytes:
+    """Key for SQLite cache digests, derived from the schema version and `weights`."""
+    material = repr((_CACHE_SCHEMA_VERSION, sorted(weights.items()))).encode()
+    return hashlib.blake2b(material, digest_size=32).digest()
+
+
+# Salts SQLite cache keys so results scored under different weights, or by a
+# different schema version, never collide.
+_weights_key = _cache_salt(_weights)
+
+# Source of the scoring core. Every weight is inlined as a literal, so the default
+# and any `configure_scoring` weights run the same, constant-only code.
+_SCORE_CORE_TEMPLATE = """
+def _score_core(th, ef, inc, vol_code, dep, debt):
+    '''
+    Numeric part of the scoring model; labels are looked up by the caller.
+
+    Returns `(score, profile_code, time_category_code)`; the codes index into
+    `_PROFILES` and `_TIME_CATEGORIES`. `dep` and `debt` only drive the qualitative
+    exposure labels, which are resolved by the caller.
+    '''
+    # Points are kept at double scale (0-140 for the default 0-70 model) so that the
+    # half-point income weight stays an integer; the score is halved only on return.
+    # Each staircase is a sum of threshold tests (True == 1), so no branches are needed.
+
+    # --- Component 1: Capacity for Risk (Financial Stability) ---
+
+    # Q1: Time Horizon (Tends to be the biggest factor)
+    tc_code = (th >= {horizon_edges[0]}) + (th >= {horizon_edges[1]})
+    score2 = {horizon_points} * tc_code
+
+    # Q2: Emergency Fund (High fund = high capacity for risk)
+    score2 += {fund_points} * ((ef >= {fund_edges[0]}) + (ef >= {fund_edges[1]}))
+
+    # Q3: Income Stability (rating 1 to 5)
+    score2 += {income_points} * (inc - 1)
+
+    # --- Component 2: Tolerance for Risk (Psychological Comfort) ---
+
+    # Q4: Market Volatility (code 0 = A / Conservative, 1 = B / Moderate, 2 = C / Aggressive)
+    score2 += {volatility_points} * vol_code
+
+    profile_code = (score2 >= {profile_edges[0]}) + (score2 >= {profile_edges[1]})
+
+    return score2 // 2, profile_code, tc_code
 """
 
-from typing import Dict, Any
+
+def _normalise_weights(weights: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge `weights` over `DEFAULT_SCORING_WEIGHTS` and validate the result.
+
+    Raises `ValueError` for unknown keys, values that are not integers, or edges
+    whose lower threshold exceeds the upper one.
+    """
+    unknown = set(weights) - set(DEFAULT_SCORING_WEIGHTS)
+    if unknown:
+        raise ValueError(f"Unknown scoring weights: {sorted(unknown)}")
+
+    merged: Dict[str, Any] = {}
+    for name, default in DEFAULT_SCORING_WEIGHTS.items():
+        value = weights.get(name, default)
+        try:
+            # Only integers ever reach the generated source.
+            if isinstance(default, tuple):
+                lower, upper = (int(edge) for edge in value)
+                merged[name] = (lower, upper)
+            else:
+                merged[name] = int(value)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid value for scoring weight {name!r}: {value!r}") from exc
+        if isinstance(default, tuple) and lower > upper:
+            raise ValueError(f"Scoring weight {name!r} has lower edge above upper edge: {value!r}")
+    return merged
+
+
+def _build_score_core(weights: Dict[str, Any]):
+    """Generate `_score_core` from `_SCORE_CORE_TEMPLATE` for validated `weights`."""
+    namespace: Dict[str, Any] = {}
+    exec(compile(_SCORE_CORE_TEMPLATE.format(**weights), "<risk_score_core>", "exec"), namespace)
+    return namespace["_score_core"]
+
+
+_score_core = _build_score_core(_weights)
+
+
+def configure_scoring(weights: Dict[str, Any]) -> None:
+    """
+    Specialise the scorer for deployment-specific weights.
+
+    `weights` overrides any subset of `DEFAULT_SCORING_WEIGHTS`. The scoring core
+    is regenerated from source with every weight inlined as a literal, so custom
+    configurations run exactly as fast as the built-in one. Call once at start-up;
+    in-process caches are cleared and the batch path picks up the same weights.
+
+    Raises `ValueError` for unknown keys, values that are not integers, or
+    reversed (lower > upper) edges.
+    """
+    global _weights, _score_core, _weights_key
+
+    merged = _normalise_weights(weights)
+
+    _weights = merged
+    _score_core = _build_score_core(merged)
+    _weights_key = _cache_salt(merged)
+    _scored.cache_clear()
+
+
+@dataclass(slots=True, frozen=True)
+class RiskResult:
+    """
+    One user's risk assessment.
+
+    A compact, immutable record (no per-instance dict), so cached results can be
+    shared freely; `to_dict` gives the FSO-ready shape returned by the tools.
+    """
+    raw_risk_score: int
+    risk_profile: str
+    investment_time_horizon: str
+    insurance_gaps: str
+    liquidity_risk: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a fresh dict for `risk_assessment_data` (safe for callers to mutate)."""
+        return {
+            "raw_risk_score": self.raw_risk_score,
+            "risk_profile": self.risk_profile,
+            "investment_time_horizon": self.investment_time_horizon,
+            "insurance_gaps": self.insurance_gaps,
+            "liquidity_risk": self.liquidity_risk
+        }
+
+
+@functools.lru_cache(maxsize=4096)
+def _scored(
+    th: int, ef: int, inc: int, vol_code: int, dep: bool, debt: bool
+) -> RiskResult:
+    """
+    Memoised full assessment for one normalised input tuple.
+
+    The input domain is small and discrete, so many users share a tuple; the
+    result is an immutable `RiskResult` that is safe to hand out repeatedly.
+    In-process misses consult the shared SQLite cache first, when one is configured.
+    """
+    conn = _cache_connection()
+    key = _cache_key(th, ef, inc, vol_code, dep, debt) if conn is not None else None
+    if key is not None:
+        row = conn.execute("SELECT result FROM risk_scores WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            from .fso import loads
+            return RiskResult(**loads(row[0]))
+
+    score, profile_code, tc_code = _score_core(th, ef, inc, vol_code, dep, debt)
+
+    # --- Component 3: Risk Exposure & Needs ---
+    # Does not affect the numerical score, but defines recommendations
+
+    insurance_gap = _INS_YES if dep else _INS_NO
+
+    liquidity_risk = _LIQ_YES if debt else _LIQ_NO
+
+    result = RiskResult(
+        score, _PROFILES[profile_code], _TIME_CATEGORIES[tc_code], insurance_gap, liquidity_risk
+    )
+
+    if key is not None:
+        from .fso import dumps
+        conn.execute(
+            "INSERT OR IGNORE INTO risk_scores (key, result) VALUES (?, ?)", (key, dumps(result.to_dict()))
+        )
+    return result
+
+
+def _cache_connection() -> Optional[sqlite3.Connection]:
+    """
+    Open (once) the cross-process SQLite cache named by `RISK_SCORE_CACHE_DB`.
+
+    Returns None when the variable is unset, which keeps the tool free of any
+    filesystem side effects by default.
+    """
+    global _cache_db
+    if _cache_db is None:
+        path = os.environ.get(CACHE_DB_ENV_VAR)
+        if not path:
+            return None
+        conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS risk_scores (key BLOB PRIMARY KEY, result TEXT)")
+        _cache_db = conn
+    return _cache_db
+
+
+def _cache_key(th: int, ef: int, inc: int, vol_code: int, dep: bool, debt: bool) -> Optional[bytes]:
+    """
+    Stable 16-byte digest of a normalised input tuple.
+
+    Returns None for inputs outside the packed int32 range; those are rare enough
+    to simply bypass the shared cache.
+    """
+    if not all(_INT32_MIN <= value <= _INT32_MAX for value in (th, ef, inc)):
+        return None
+    packed = struct.pack("<iiiBBB", th, ef, inc, vol_code, dep, debt)
+    return hashlib.blake2b(packed, digest_size=16, key=_weights_key).digest()
+
+
 def risk_score_calculator(
     time_horizon_years: int,
     emergency_fund_months: int,
@@ -37,165 +328,172 @@ def risk_score_calculator(
     debt_exceeds_assets: bool
 ) -> Dict[str, Any]:
     """
-    Calculate a user's investment risk score and derive a qualitative risk profile.
+    Score a user's investment risk and return their `risk_assessment_data`.
+
+    Args:
+        time_horizon_years: Years until the money is needed.
+        emergency_fund_months: Months of expenses covered by emergency savings.
+        income_stability_rating: 1 (unstable) to 5 (highly stable); 5 for retirees
+            with a safe withdrawal rate.
+        volatility_choice: Reaction to a 20% market drop: "A"/"sell",
+            "B"/"hold", or "C"/"invest more".
+        has_dependents: Whether anyone relies on the user financially.
+        debt_exceeds_assets: Whether the user's debts exceed their assets.
+
+    Returns:
+        raw_risk_score, risk_profile, investment_time_horizon, insurance_gaps
+        and liquidity_risk.
+    """
+    # Unrecognised answers are treated as Conservative (code 0).
+    vol_code = _VOL_CODE.get(volatility_choice.strip().lower(), 0)
+
+    # Normalise types so equal inputs share one cache entry (10 and 10.0 alike) and
+    # the SQLite key packing always receives plain ints and bools.
+    # `to_dict` builds a fresh dict per call, so callers may mutate it freely.
+    return _scored(
+        int(time_horizon_years),
+        int(emergency_fund_months),
+        int(income_stability_rating),
+        vol_code,
+        bool(has_dependents),
+        bool(debt_exceeds_assets),
+    ).to_dict()
 
-    This scoring model combines:
-    - **Risk Capacity (Financial Stability)**
-    - **Risk Tolerance (Behavioral Response to Volatility)**
-    - **Risk Exposure (Protection gaps and liquidity risk)**
 
-    The output is structured for direct insertion into the Financial State Object (FSO)
-    under the key `risk_assessment_data`.
+def risk_score_calculator_batch(
+    time_horizon_years,
+    emergency_fund_months,
+    income_stability_rating,
+    volatility_code,
+    has_dependents,
+    debt_exceeds_assets
+) -> Dict[str, Any]:
+    """
+    Vectorised form of `risk_score_calculator` for scoring many users at once.
+
+    Intended for cohort work (back-testing, what-if grids, Monte-Carlo sweeps over
+    horizon/income assumptions) where a per-row Python call would dominate. The
+    scoring rules are identical to the scalar tool; only the evaluation is done
+    with NumPy array operations.
 
     -------------------------------------------------------------------------------
     PARAMETERS
     -------------------------------------------------------------------------------
-    time_horizon_years : int
-        The user's investment time horizon (in years).  
-        - >= 15 years  → More aggressive capacity  
-        -   5-14 years → Moderate capacity  
-        -   < 5 years  → Conservative capacity  
-
-    emergency_fund_months : int
-        Number of months the client can sustain expenses using emergency funds.  
-        Thresholds:  
-        - >= 6 months → Strong buffer  
-        - 3-5 months → Moderate buffer  
-        - < 3 months → Weak buffer  
-
-    income_stability_rating : int  
-        A subjective score from 1 (unstable) to 5 (highly stable).  
-        If the user is *retired with a safe withdrawal rate*, the Risk Agent may assign  
-        this value automatically (usually 5).
-
-    volatility_choice : str  
-        Behavioral response to a 20% market drop.  
-        Accepted patterns (case-insensitive):  
-        - "A", "sell" → Conservative  
-        - "B", "hold", "hold steady" → Moderate  
-        - "C", "invest more" → Aggressive  
-
-    has_dependents : bool  
-        Indicates whether the user has financial dependents  
-        (used for determining insurance gap severity).
-
-    debt_exceeds_assets : bool  
-        Indicates whether the user is in a net-liability position.  
-        Used for evaluating liquidity risk.
+    All arguments are equal-length 1-D array-likes, one element per user.
+
+    time_horizon_years, emergency_fund_months, income_stability_rating : int
+        Same meaning as in `risk_score_calculator`.
+
+    volatility_code : int
+        Volatility answer encoded as 0 = A / sell, 1 = B / hold, 2 = C / invest more.
+        Any other code raises `ValueError`.
+
+    has_dependents, debt_exceeds_assets : bool
+        Same meaning as in `risk_score_calculator`.
 
     -------------------------------------------------------------------------------
     RETURNS
     -------------------------------------------------------------------------------
-    Dict[str, Any]:
-        {
-            "raw_risk_score": int,
-                Numerical score (0-100 scale approximation).
-            
-            "risk_profile": str,
-                One of: "Conservative", "Moderate", "Aggressive".
-            
-            "investment_time_horizon": str,
-                Categorized horizon label (e.g., "Long-term (Aggressive Capacity)").
-            
-            "insurance_gaps": str,
-                Guidance on whether additional insurance coverage may be needed.
-            
-            "liquidity_risk": str,
-                High-level assessment of balance sheet risk ("Balanced" or "High Liquidity Risk").
-        }
+    Dict[str, numpy.ndarray]:
+        Column-oriented result with the same keys as `risk_score_calculator`
+        ("raw_risk_score", "risk_profile", "investment_time_horizon",
+        "insurance_gaps", "liquidity_risk"), each holding one entry per user.
+    """
+    import numpy as np  # Only needed for batch scoring.
 
-    -------------------------------------------------------------------------------
-    NOTES
-    -------------------------------------------------------------------------------
-    • The scoring logic is intentionally simplified for LLM orchestration workflows.  
-    • The agent using this function must ensure correct parsing of qualitative inputs.  
-    • The function does NOT handle missing/invalid inputs—validation belongs in the agent.
+    # Explicit integer dtypes: np.asarray([]) would otherwise be float64, which
+    # np.choose cannot use as an index array.
+    th = np.asarray(time_horizon_years, dtype=np.int64)
+    ef = np.asarray(emergency_fund_months, dtype=np.int64)
+    inc = np.asarray(income_stability_rating, dtype=np.int64)
+    vol = np.asarray(volatility_code, dtype=np.intp)
+    dep = np.asarray(has_dependents, dtype=bool)
+    debt = np.asarray(debt_exceeds_assets, dtype=bool)
+    if vol.size and (vol.min() < 0 or vol.max() > 2):
+        raise ValueError("volatility_code must be 0 (A), 1 (B) or 2 (C)")
 
-    -------------------------------------------------------------------------------
-    EXAMPLE (OUTPUT)
-    -------------------------------------------------------------------------------
-    {
-        "raw_risk_score": 62,
-        "risk_profile": "Aggressive",
-        "investment_time_horizon": "Long-term (Aggressive Capacity)",
-        "insurance_gaps": "Potential Need for Life and Disability Insurance.",
-        "liquidity_risk": "Balanced."
+    # Double-scale integer points, as in `_score_core`, using the active weights.
+    w = _weights
+    h_low, h_high = w["horizon_edges"]
+    f_low, f_high = w["fund_edges"]
+    p_low, p_high = w["profile_edges"]
+
+    # --- Component 1: Capacity for Risk ---
+    capacity2 = (
+        np.select([th >= h_high, th >= h_low], [2 * w["horizon_points"], w["horizon_points"]], default=0)
+        + np.select([ef >= f_high, ef >= f_low], [2 * w["fund_points"], w["fund_points"]], default=0)
+        + (inc - 1) * w["income_points"]
+    )
+
+    # --- Component 2: Tolerance for Risk ---
+    tolerance2 = np.choose(vol, [0, w["volatility_points"], 2 * w["volatility_points"]])
+
+    score2 = capacity2 + tolerance2
+
+    return {
+        "raw_risk_score": score2 // 2,
+        "risk_profile": np.select(
+            [score2 >= p_high, score2 >= p_low], [_PROFILE_AGGRESSIVE, _PROFILE_MODERATE],
+            default=_PROFILE_CONSERVATIVE,
+        ),
+        "investment_time_horizon": np.select(
+            [th >= h_high, th >= h_low], [_TIME_LONG, _TIME_MEDIUM], default=_TIME_SHORT
+        ),
+        "insurance_gaps": np.where(dep, _INS_YES, _INS_NO),
+        "liquidity_risk": np.where(debt, _LIQ_YES, _LIQ_NO),
     }
-    """
 
-def risk_score_calculator(
-    time_horizon_years: int,
-    emergency_fund_months: int,
-    income_stability_rating: int,
-    volatility_choice: str,
-    has_dependents: bool,
-    debt_exceeds_assets: bool
-) -> Dict[str, Any]:
-    """
-    Calculates a numerical risk score (0 to 100) based on financial stability 
-    and psychological tolerance, and identifies key risk exposures.
-    
-    A higher score indicates a higher capacity and tolerance for risk.
+
+def risk_score_calculator_bulk(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    score = 0
-    max_score = 100
-    
-    # --- Component 1: Capacity for Risk (Financial Stability) ---
-    # Max 40 points
+    Score several users in one tool call.
 
-    # Q1: Time Horizon (Tends to be the biggest factor)
-    if time_horizon_years >= 15:
-        score += 20
-        time_category = "Long-term (Aggressive Capacity)"
-    elif time_horizon_years >= 5:
-        score += 10
-        time_category = "Medium-term (Moderate Capacity)"
-    else:
-        time_category = "Short-term (Conservative Capacity)"
+    Used by the agent when the FSO carries a `users` list (advisor workflows,
+    cohort re-profiling), so N users cost a single tool round-trip instead of N.
+    Scoring runs through `risk_score_calculator_batch` when NumPy is installed and
+    falls back to one `risk_score_calculator` call per row otherwise.
 
-    # Q2: Emergency Fund (High fund = high capacity for risk)
-    if emergency_fund_months >= 6:
-        score += 10
-    elif emergency_fund_months >= 3:
-        score += 5
-    
-    # Q3: Income Stability
-    score += (income_stability_rating - 1) * 2.5 # (1 to 5 maps to 0 to 10 points)
+    -------------------------------------------------------------------------------
+    PARAMETERS
+    -------------------------------------------------------------------------------
+    rows : List[Dict[str, Any]]
+        One object per user with the same six keys as `risk_score_calculator`:
+        time_horizon_years, emergency_fund_months, income_stability_rating,
+        volatility_choice, has_dependents, debt_exceeds_assets.
 
-    # --- Component 2: Tolerance for Risk (Psychological Comfort) ---
-    # Max 30 points
-    
-    # Q4: Market Volatility
-    if volatility_choice.lower() in ('c', 'invest more'):
-        score += 30 # Aggressive tolerance
-    elif volatility_choice.lower() in ('b', 'hold steady'):
-        score += 15 # Moderate tolerance
-    # Else: Conservative tolerance (0 points added)
+    -------------------------------------------------------------------------------
+    RETURNS
+    -------------------------------------------------------------------------------
+    List[Dict[str, Any]]:
+        One `risk_score_calculator`-shaped result per row, in input order.
+    """
+    if not rows:
+        return []
 
-    # --- Component 3: Risk Exposure & Needs ---
-    # Does not affect the numerical score, but defines recommendations
+    try:
+        import numpy  # noqa: F401  (availability check for the batch path)
+    except ImportError:  # NumPy is optional; score row by row instead.
+        return [
+            risk_score_calculator(
+                row["time_horizon_years"],
+                row["emergency_fund_months"],
+                row["income_stability_rating"],
+                str(row["volatility_choice"]),
+                row["has_dependents"],
+                row["debt_exceeds_assets"],
+            )
+            for row in rows
+        ]
 
-    insurance_gap = "Potential Need for Life and Disability Insurance." if has_dependents else "Basic Coverage Only."
-    
-    liquidity_risk = "High Liquidity Risk and Financial Stress." if debt_exceeds_assets else "Balanced."
-
-    # --- Final Output ---
-    
-    # Scale score to a percentage (since max_score isn't always 100 with this simple logic)
-    # Note: For a real system, you'd make sure the max possible score is 100.
-    # For this example, we'll categorize the raw score.
-    
-    if score >= 60:
-        risk_profile = "Aggressive"
-    elif score >= 35:
-        risk_profile = "Moderate"
-    else:
-        risk_profile = "Conservative"
+    batch = risk_score_calculator_batch(
+        [row["time_horizon_years"] for row in rows],
+        [row["emergency_fund_months"] for row in rows],
+        [row["income_stability_rating"] for row in rows],
+        [_VOL_CODE.get(str(row["volatility_choice"]).strip().lower(), 0) for row in rows],
+        [row["has_dependents"] for row in rows],
+        [row["debt_exceeds_assets"] for row in rows],
+    )
 
-    return {
-        "raw_risk_score": score,
-        "risk_profile": risk_profile,
-        "investment_time_horizon": time_category,
-        "insurance_gaps": insurance_gap,
-        "liquidity_risk": liquidity_risk
-    }
\ No newline at end of file
+    # .tolist() converts NumPy scalars back to plain, JSON-serialisable Python values.
+    columns = {key: values.tolist() for key, values in batch.items()}
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]